@@ -0,0 +1,188 @@
+#!/usr/bin/env python3
+"""
+📝 CACHE - Asynchronous Structured Logging
+Queue-based logging so request threads never block on disk or stdout writes
+"""
+
+import os
+import sys
+import copy
+import json
+import time
+import queue
+import atexit
+import logging
+import itertools
+import threading
+import contextvars
+from contextlib import contextmanager
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+
+# Per-request correlation ID and stage timings (set by the Flask request hooks)
+request_id_var = contextvars.ContextVar('request_id', default=None)
+stage_timings_var = contextvars.ContextVar('stage_timings', default=None)
+
+# Pass as extra= on high-volume (e.g. per-frame) log calls; only one in
+# LOG_SAMPLE_EVERY of these records is kept, counted per call site
+SAMPLED = {'sampled': True}
+
+LOG_SAMPLE_EVERY = int(os.getenv('LOG_SAMPLE_EVERY', '20'))
+LOG_MAX_BYTES = int(os.getenv('LOG_MAX_BYTES', str(10 * 1024 * 1024)))
+LOG_BACKUP_COUNT = int(os.getenv('LOG_BACKUP_COUNT', '5'))
+
+# Standard LogRecord attributes; anything else on a record came from extra=
+_RESERVED_ATTRS = set(vars(logging.LogRecord('', 0, '', 0, '', (), None))) | {'message', 'asctime'}
+
+_listener = None
+
+# Worker threads share the request's timings dict (see ContextThreadPoolExecutor)
+_timings_lock = threading.Lock()
+
+
+class JsonFormatter(logging.Formatter):
+    """Render records as one JSON object per line, including extra= fields"""
+
+    def format(self, record):
+        entry = {
+            'timestamp': datetime.fromtimestamp(record.created, timezone.utc).isoformat(),
+            'level': record.levelname,
+            'logger': record.name,
+            'message': record.getMessage()
+        }
+        for key, value in vars(record).items():
+            if key not in _RESERVED_ATTRS and key != 'sampled':
+                entry[key] = value
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            entry['exception'] = record.exc_text
+        return json.dumps(entry, default=str, ensure_ascii=False)
+
+
+class RequestContextFilter(logging.Filter):
+    """Attach the current request ID and drop all but 1-in-N sampled records per call site
+
+    Runs in the calling thread, so the context is read before the record is
+    handed to the background writer and discarded records never get queued.
+    """
+
+    def __init__(self, sample_every=LOG_SAMPLE_EVERY):
+        super().__init__()
+        self.sample_every = max(1, sample_every)
+        self.sample_counters = {}
+
+    def filter(self, record):
+        if getattr(record, 'sampled', False):
+            # Separate counters so interleaved call sites are each sampled
+            counter = self.sample_counters.setdefault((record.pathname, record.lineno), itertools.count())
+            if next(counter) % self.sample_every:
+                return False
+            record.sample_rate = self.sample_every
+
+        request_id = request_id_var.get()
+        if request_id is not None:
+            record.request_id = request_id
+        return True
+
+
+class StructuredQueueHandler(QueueHandler):
+    """QueueHandler that keeps the message and traceback as separate fields
+
+    The stock prepare() folds the traceback into the message and drops
+    exc_info; here the traceback travels as exc_text instead, which every
+    formatter on the listener side knows how to render.
+    """
+
+    def prepare(self, record):
+        record = copy.copy(record)
+        record.message = record.getMessage()
+        record.msg = record.message
+        record.args = None
+        if record.exc_info and not record.exc_text:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+        record.exc_info = None
+        return record
+
+
+def configure_logging(log_file=None, level=logging.INFO):
+    """Route all logging through a queue drained by a background writer thread
+
+    Safe to call more than once; only the first call installs handlers.
+    """
+    global _listener
+    if _listener is not None:
+        return
+
+    handlers = []
+
+    console_handler = logging.StreamHandler(sys.stdout)
+    console_handler.setFormatter(logging.Formatter('%(asctime)s - %(levelname)s - %(message)s'))
+    handlers.append(console_handler)
+
+    if log_file:
+        file_handler = RotatingFileHandler(log_file, maxBytes=LOG_MAX_BYTES, backupCount=LOG_BACKUP_COUNT)
+        file_handler.setFormatter(JsonFormatter())
+        handlers.append(file_handler)
+
+    log_queue = queue.SimpleQueue()
+    queue_handler = StructuredQueueHandler(log_queue)
+    queue_handler.addFilter(RequestContextFilter())
+
+    root = logging.getLogger()
+    for handler in list(root.handlers):
+        root.removeHandler(handler)
+    root.addHandler(queue_handler)
+    root.setLevel(level)
+
+    _listener = QueueListener(log_queue, *handlers, respect_handler_level=True)
+    _listener.start()
+    atexit.register(shutdown_logging)
+
+
+def shutdown_logging():
+    """Flush queued records and stop the background writer"""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+
+def begin_request(request_id):
+    """Start a new logging context for a request"""
+    request_id_var.set(request_id)
+    stage_timings_var.set({})
+
+
+def end_request():
+    """Return the stage timings recorded for the current request and clear the context"""
+    timings = stage_timings_var.get() or {}
+    request_id_var.set(None)
+    stage_timings_var.set(None)
+    return timings
+
+
+@contextmanager
+def stage_timer(stage):
+    """Record how long a processing stage takes (in ms) for the current request"""
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        timings = stage_timings_var.get()
+        if timings is not None:
+            elapsed_ms = (time.perf_counter() - started) * 1000
+            with _timings_lock:
+                timings[stage] = round(timings.get(stage, 0.0) + elapsed_ms, 2)
+
+
+class ContextThreadPoolExecutor(ThreadPoolExecutor):
+    """ThreadPoolExecutor that runs each task in a copy of the submitter's context
+
+    Keeps the request ID and stage timings visible to worker threads, so
+    records logged there stay correlated with their request.
+    """
+
+    def submit(self, fn, *args, **kwargs):
+        return super().submit(contextvars.copy_context().run, fn, *args, **kwargs)
@@ -5,17 +5,52 @@ Uses computer vision to detect helmets in uploaded images
 """
 
 import cv2
+import math
 import numpy as np
 import base64
 import io
-from PIL import Image
+from PIL import Image, ImageOps
 import logging
 from datetime import datetime
 
-# Configure logging
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Longest side (in pixels) images are decoded to for detection. JPEGs are
+# first reduced in the DCT domain via PIL's draft mode (1/2, 1/4 or 1/8), so
+# the full-size bitmap is never materialised, then resampled down to this
+# bound; other formats are just resampled. Full resolution is available on demand.
+DECODE_MAX_DIMENSION = 800
+
+# Number plate localization: candidate boxes are found on the reduced decode;
+# only when some are found is the upload decoded at full resolution to crop them.
+# If OCR of the crops yields no plate, the reduced whole image is sent instead.
+PLATE_ASPECT_RANGE = (1.2, 6.0)  # two-row bike plates up to single-row car plates
+PLATE_EDGE_DENSITY_RANGE = (0.15, 0.75)
+PLATE_BRIGHT_THRESHOLD = 200  # white/yellow plate background in grayscale
+PLATE_MIN_FILL = 0.6  # contour area / bounding box area for bright plate blobs
+PLATE_MIN_AREA_FRACTION = 0.0005
+PLATE_MAX_AREA_FRACTION = 0.1
+PLATE_MAX_CANDIDATES = 4
+PLATE_CROP_HEIGHT = 64
+
+# Dome-shape scoring (contour circularity on the head region's edge map)
+SHAPE_MIN_CONTOUR_AREA = 100
+SHAPE_MAX_CONTOURS = 256
+
+# Helmet color ranges in HSV (common helmet colors)
+HELMET_COLOR_RANGES = [
+    # Black helmets
+    (np.array([0, 0, 0], dtype=np.uint8), np.array([180, 255, 50], dtype=np.uint8)),
+    # White helmets
+    (np.array([0, 0, 200], dtype=np.uint8), np.array([180, 30, 255], dtype=np.uint8)),
+    # Red helmets
+    (np.array([0, 120, 70], dtype=np.uint8), np.array([10, 255, 255], dtype=np.uint8)),
+    # Blue helmets
+    (np.array([100, 150, 0], dtype=np.uint8), np.array([130, 255, 255], dtype=np.uint8)),
+    # Yellow helmets
+    (np.array([20, 100, 100], dtype=np.uint8), np.array([30, 255, 255], dtype=np.uint8))
+]
+
 class HelmetDetector:
     def __init__(self):
         """Initialize the helmet detection model"""
@@ -35,18 +70,44 @@ class HelmetDetector:
         except Exception as e:
             logger.error(f"❌ Failed to load models: {str(e)}")
     
-    def preprocess_image(self, image_data):
-        """Convert base64 image to OpenCV format"""
+    def decode_image(self, image_data, full_resolution=False):
+        """Decode base64 (or raw bytes) image data to OpenCV format with EXIF orientation applied
+
+        Returns (cv_image, scale) where scale maps decoded pixel coordinates
+        back to the original (upright) image. Unless full_resolution is set,
+        the longest side is at most DECODE_MAX_DIMENSION.
+        """
         try:
-            # Remove data URL prefix if present
-            if ',' in image_data:
-                image_data = image_data.split(',')[1]
-            
-            # Decode base64
-            image_bytes = base64.b64decode(image_data)
+            if isinstance(image_data, bytes):
+                # Raw binary upload
+                image_bytes = image_data
+            else:
+                # Remove data URL prefix if present
+                if ',' in image_data:
+                    image_data = image_data.split(',')[1]
+                
+                # Decode base64
+                image_bytes = base64.b64decode(image_data)
             
-            # Convert to PIL Image
+            # Open lazily; pixel data is not decoded until draft/load
             pil_image = Image.open(io.BytesIO(image_bytes))
+            original_width, original_height = pil_image.size
+            
+            if not full_resolution and max(original_width, original_height) > DECODE_MAX_DIMENSION:
+                # DCT-domain reduction for JPEGs (no-op for other formats); draft
+                # keeps the result at or above the requested size
+                ratio = DECODE_MAX_DIMENSION / float(max(original_width, original_height))
+                pil_image.draft('RGB', (int(original_width * ratio), int(original_height * ratio)))
+                # Resample the remainder so the longest side is <= DECODE_MAX_DIMENSION
+                pil_image.thumbnail((DECODE_MAX_DIMENSION, DECODE_MAX_DIMENSION), reducing_gap=None)
+            
+            # Rotate phone photos upright using their EXIF orientation tag
+            orientation = pil_image.getexif().get(0x0112, 1)
+            if orientation != 1:
+                pil_image = ImageOps.exif_transpose(pil_image)
+                if orientation in (5, 6, 7, 8):
+                    # Width and height swap for 90/270 degree rotations
+                    original_width = original_height
             
             # Convert to RGB if necessary
             if pil_image.mode != 'RGB':
@@ -55,11 +116,17 @@ class HelmetDetector:
             # Convert to OpenCV format
             cv_image = cv2.cvtColor(np.array(pil_image), cv2.COLOR_RGB2BGR)
             
-            return cv_image
+            scale = original_width / float(cv_image.shape[1])
+            return cv_image, scale
             
         except Exception as e:
             logger.error(f"❌ Image preprocessing failed: {str(e)}")
-            return None
+            return None, 1.0
+    
+    def preprocess_image(self, image_data, full_resolution=False):
+        """Convert base64 image to OpenCV format"""
+        cv_image, _ = self.decode_image(image_data, full_resolution=full_resolution)
+        return cv_image
     
     def detect_faces_and_heads(self, image):
         """Detect faces and head regions in the image"""
@@ -80,79 +147,132 @@ class HelmetDetector:
             logger.error(f"❌ Face detection failed: {str(e)}")
             return []
     
+    def extract_helmet_region(self, image, face_rect):
+        """Crop the head region above the face"""
+        x, y, w, h = face_rect
+        
+        # Define helmet region (above the face)
+        helmet_y = max(0, y - int(h * 0.8))
+        helmet_h = int(h * 1.2)
+        return image[helmet_y:y + helmet_h, x:x + w]
+    
+    def color_coverage_batch(self, regions):
+        """Fraction of helmet-colored pixels for each region, in one pass
+
+        All regions are flattened into a single 1-pixel-high strip so the HSV
+        conversion and each inRange run once over the whole batch. Both are
+        per-pixel operations, so the result equals analyzing each region alone.
+        """
+        sizes = [region.shape[0] * region.shape[1] for region in regions]
+        strip = np.concatenate([region.reshape(1, -1, 3) for region in regions], axis=1)
+        
+        # Convert to HSV for better color analysis
+        hsv = cv2.cvtColor(strip, cv2.COLOR_BGR2HSV)
+        
+        helmet_pixels = np.zeros(len(regions), dtype=np.int64)
+        offsets = np.concatenate(([0], np.cumsum(sizes)[:-1]))
+        for (lower, upper) in HELMET_COLOR_RANGES:
+            mask = cv2.inRange(hsv, lower, upper).ravel()
+            helmet_pixels += np.add.reduceat((mask > 0).astype(np.int64), offsets)
+        
+        return helmet_pixels / np.array(sizes, dtype=np.float64)
+    
+    def shape_score(self, helmet_region):
+        """Score rounded, dome-like contours in the head region"""
+        gray_region = cv2.cvtColor(helmet_region, cv2.COLOR_BGR2GRAY)
+        edges = cv2.Canny(gray_region, 50, 150)
+        
+        contours, _ = cv2.findContours(edges, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
+        return self.contour_shape_score(contours)
+    
+    def contour_shape_score(self, contours):
+        """Sum of helmet-like circularities (0.3-0.9) over contours with area > 100
+
+        Up to SHAPE_MAX_CONTOURS contours the score is exactly that of the plain
+        contourArea/arcLength loop (same calls, same order); zero-area fragments
+        (< 3 points) are just skipped without a call. Beyond that only the
+        contours with the most points are scored, so the score can only be lower.
+        """
+        if len(contours) > SHAPE_MAX_CONTOURS:
+            contours = sorted(contours, key=len, reverse=True)[:SHAPE_MAX_CONTOURS]
+        
+        contour_area = cv2.contourArea
+        arc_length = cv2.arcLength
+        helmet_shape_score = 0.0
+        for contour in contours:
+            if len(contour) < 3:
+                continue
+            area = contour_area(contour)
+            if area > SHAPE_MIN_CONTOUR_AREA:
+                perimeter = arc_length(contour, True)
+                if perimeter > 0:
+                    circularity = 4 * math.pi * area / (perimeter * perimeter)
+                    if 0.3 < circularity < 0.9:  # Helmet-like circularity
+                        helmet_shape_score += circularity
+        
+        return helmet_shape_score
+    
+    def combine_scores(self, helmet_coverage, helmet_shape_score):
+        """Combine color and shape analysis into (has_helmet, confidence)"""
+        confidence = (helmet_coverage * 0.6 + min(helmet_shape_score, 1.0) * 0.4)
+        has_helmet = confidence > 0.15  # Threshold for helmet detection
+        
+        return bool(has_helmet), float(min(confidence * 100, 95.0))  # Cap at 95% confidence
+    
     def analyze_helmet_region(self, image, face_rect):
         """Analyze the head region above the face for helmet presence"""
         try:
-            x, y, w, h = face_rect
-            
-            # Define helmet region (above the face)
-            helmet_y = max(0, y - int(h * 0.8))
-            helmet_h = int(h * 1.2)
-            helmet_region = image[helmet_y:y + helmet_h, x:x + w]
+            helmet_region = self.extract_helmet_region(image, face_rect)
             
             if helmet_region.size == 0:
                 return False, 0.0
             
-            # Convert to HSV for better color analysis
-            hsv = cv2.cvtColor(helmet_region, cv2.COLOR_BGR2HSV)
-            
-            # Define helmet color ranges (common helmet colors)
-            helmet_colors = [
-                # Black helmets
-                ([0, 0, 0], [180, 255, 50]),
-                # White helmets  
-                ([0, 0, 200], [180, 30, 255]),
-                # Red helmets
-                ([0, 120, 70], [10, 255, 255]),
-                # Blue helmets
-                ([100, 150, 0], [130, 255, 255]),
-                # Yellow helmets
-                ([20, 100, 100], [30, 255, 255])
-            ]
-            
-            helmet_pixels = 0
-            total_pixels = helmet_region.shape[0] * helmet_region.shape[1]
-            
-            for (lower, upper) in helmet_colors:
-                lower = np.array(lower, dtype=np.uint8)
-                upper = np.array(upper, dtype=np.uint8)
-                mask = cv2.inRange(hsv, lower, upper)
-                helmet_pixels += cv2.countNonZero(mask)
-            
-            # Calculate helmet coverage percentage
-            helmet_coverage = helmet_pixels / total_pixels
-            
-            # Additional shape analysis
-            gray_region = cv2.cvtColor(helmet_region, cv2.COLOR_BGR2GRAY)
-            edges = cv2.Canny(gray_region, 50, 150)
-            contours, _ = cv2.findContours(edges, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
-            
-            # Look for helmet-like shapes (rounded, dome-like)
-            helmet_shape_score = 0
-            for contour in contours:
-                area = cv2.contourArea(contour)
-                if area > 100:  # Minimum area threshold
-                    perimeter = cv2.arcLength(contour, True)
-                    if perimeter > 0:
-                        circularity = 4 * np.pi * area / (perimeter * perimeter)
-                        if 0.3 < circularity < 0.9:  # Helmet-like circularity
-                            helmet_shape_score += circularity
-            
-            # Combine color and shape analysis
-            confidence = (helmet_coverage * 0.6 + min(helmet_shape_score, 1.0) * 0.4)
-            has_helmet = confidence > 0.15  # Threshold for helmet detection
-            
-            return has_helmet, min(confidence * 100, 95.0)  # Cap at 95% confidence
+            helmet_coverage = self.color_coverage_batch([helmet_region])[0]
+            return self.combine_scores(helmet_coverage, self.shape_score(helmet_region))
             
         except Exception as e:
             logger.error(f"❌ Helmet analysis failed: {str(e)}")
             return False, 0.0
     
-    def detect_helmet(self, image_data):
-        """Main helmet detection function"""
+    def summarize_results(self, helmet_results):
+        """Build the detection response from per-face results"""
+        if len(helmet_results) == 0:
+            return {
+                'success': True,
+                'message': 'No person detected in image',
+                'has_helmet': False,
+                'confidence': 0.0,
+                'person_count': 0
+            }
+        
+        # Overall analysis
+        total_people = len(helmet_results)
+        people_with_helmets = sum(1 for result in helmet_results if result['has_helmet'])
+        people_without_helmets = total_people - people_with_helmets
+        
+        # Calculate overall confidence
+        avg_confidence = np.mean([result['confidence'] for result in helmet_results])
+        
+        return {
+            'success': True,
+            'person_count': total_people,
+            'people_with_helmets': people_with_helmets,
+            'people_without_helmets': people_without_helmets,
+            'has_violation': people_without_helmets > 0,
+            'confidence': round(avg_confidence, 2),
+            'detailed_results': helmet_results,
+            'timestamp': datetime.now().isoformat()
+        }
+    
+    def detect_helmet(self, image_data, decoded=None):
+        """Main helmet detection function
+
+        decoded is an optional (image, scale) pair from decode_image, so callers
+        that also run plate OCR decode the upload only once.
+        """
         try:
-            # Preprocess image
-            image = self.preprocess_image(image_data)
+            # Preprocess image (reduced-size decode)
+            image, scale = decoded if decoded is not None else self.decode_image(image_data)
             if image is None:
                 return {
                     'success': False,
@@ -164,15 +284,6 @@ class HelmetDetector:
             # Detect faces
             faces = self.detect_faces_and_heads(image)
             
-            if len(faces) == 0:
-                return {
-                    'success': True,
-                    'message': 'No person detected in image',
-                    'has_helmet': False,
-                    'confidence': 0.0,
-                    'person_count': 0
-                }
-            
             # Analyze each detected face for helmet
             helmet_results = []
             for face in faces:
@@ -180,27 +291,11 @@ class HelmetDetector:
                 helmet_results.append({
                     'has_helmet': has_helmet,
                     'confidence': confidence,
-                    'face_region': face.tolist()
+                    # Report face regions in original image coordinates
+                    'face_region': [int(round(v * scale)) for v in face]
                 })
             
-            # Overall analysis
-            total_people = len(faces)
-            people_with_helmets = sum(1 for result in helmet_results if result['has_helmet'])
-            people_without_helmets = total_people - people_with_helmets
-            
-            # Calculate overall confidence
-            avg_confidence = np.mean([result['confidence'] for result in helmet_results])
-            
-            return {
-                'success': True,
-                'person_count': total_people,
-                'people_with_helmets': people_with_helmets,
-                'people_without_helmets': people_without_helmets,
-                'has_violation': people_without_helmets > 0,
-                'confidence': round(avg_confidence, 2),
-                'detailed_results': helmet_results,
-                'timestamp': datetime.now().isoformat()
-            }
+            return self.summarize_results(helmet_results)
             
         except Exception as e:
             logger.error(f"❌ Helmet detection failed: {str(e)}")
@@ -210,15 +305,208 @@ class HelmetDetector:
                 'has_helmet': False,
                 'confidence': 0.0
             }
+    
+    def _plate_boxes(self, mask, edges, image_area, min_fill=0.0):
+        """Plate-shaped bounding boxes of mask blobs, with their edge density"""
+        contours, _ = cv2.findContours(mask, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
+        boxes = []
+        for contour in contours:
+            x, y, w, h = cv2.boundingRect(contour)
+            area_fraction = (w * h) / image_area
+            if not PLATE_MIN_AREA_FRACTION < area_fraction < PLATE_MAX_AREA_FRACTION:
+                continue
+            if not PLATE_ASPECT_RANGE[0] <= w / float(h) <= PLATE_ASPECT_RANGE[1]:
+                continue
+            if min_fill and cv2.contourArea(contour) / float(w * h) < min_fill:
+                continue
+            
+            edge_density = cv2.countNonZero(edges[y:y + h, x:x + w]) / float(w * h)
+            if PLATE_EDGE_DENSITY_RANGE[0] < edge_density < PLATE_EDGE_DENSITY_RANGE[1]:
+                boxes.append((edge_density, (x, y, w, h)))
+        
+        boxes.sort(key=lambda box: box[0], reverse=True)
+        return [rect for _, rect in boxes]
+    
+    def locate_plate_regions(self, image, max_candidates=PLATE_MAX_CANDIDATES):
+        """Find candidate number plate rectangles by edge density, aspect ratio and contours
+
+        Bright, rectangular blobs containing text (white/yellow plates) come
+        first, then blobs of merged character edges; each group is ordered by
+        edge density, densest first.
+        """
+        try:
+            gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
+            smoothed = cv2.bilateralFilter(gray, 9, 75, 75)
+            image_area = float(image.shape[0] * image.shape[1])
+            
+            # Plate characters produce dense vertical strokes
+            edges = cv2.convertScaleAbs(cv2.Sobel(smoothed, cv2.CV_16S, 1, 0, ksize=3))
+            _, edges = cv2.threshold(edges, 0, 255, cv2.THRESH_BINARY + cv2.THRESH_OTSU)
+            
+            # Bright plate backgrounds; opening detaches them from bright bodywork
+            _, bright = cv2.threshold(gray, PLATE_BRIGHT_THRESHOLD, 255, cv2.THRESH_BINARY)
+            bright = cv2.morphologyEx(bright, cv2.MORPH_OPEN, cv2.getStructuringElement(cv2.MORPH_RECT, (3, 3)))
+            bright = cv2.morphologyEx(bright, cv2.MORPH_CLOSE, cv2.getStructuringElement(cv2.MORPH_RECT, (5, 3)))
+            
+            # Merge characters into solid plate-shaped blobs
+            closed = cv2.morphologyEx(edges, cv2.MORPH_CLOSE, cv2.getStructuringElement(cv2.MORPH_RECT, (17, 5)))
+            
+            rects = self._plate_boxes(bright, edges, image_area, min_fill=PLATE_MIN_FILL)
+            rects += [rect for rect in self._plate_boxes(closed, edges, image_area) if rect not in rects]
+            return rects[:max_candidates]
+            
+        except Exception as e:
+            logger.error(f"❌ Plate localization failed: {str(e)}")
+            return []
+    
+    def build_plate_montage(self, image, plate_rects):
+        """Stack contrast-normalized grayscale plate crops into one image"""
+        clahe = cv2.createCLAHE(clipLimit=2.0, tileGridSize=(4, 4))
+        crops = []
+        for x, y, w, h in plate_rects:
+            # Pad slightly so edge characters are not clipped
+            pad_x, pad_y = int(w * 0.05), int(h * 0.1)
+            crop = image[max(0, y - pad_y):y + h + pad_y, max(0, x - pad_x):x + w + pad_x]
+            gray = cv2.cvtColor(crop, cv2.COLOR_BGR2GRAY)
+            width = max(1, int(round(gray.shape[1] * PLATE_CROP_HEIGHT / float(gray.shape[0]))))
+            gray = cv2.resize(gray, (width, PLATE_CROP_HEIGHT), interpolation=cv2.INTER_AREA)
+            crops.append(clahe.apply(gray))
+        
+        # White separators keep OCR from joining lines across crops
+        montage_width = max(crop.shape[1] for crop in crops)
+        rows = []
+        for crop in crops:
+            row = np.full((PLATE_CROP_HEIGHT + 16, montage_width), 255, dtype=np.uint8)
+            row[8:8 + PLATE_CROP_HEIGHT, :crop.shape[1]] = crop
+            rows.append(row)
+        return np.vstack(rows)
+    
+    def encode_ocr_image(self, image):
+        """JPEG-encode an image for OCR submission"""
+        ok, encoded = cv2.imencode('.jpg', image, [cv2.IMWRITE_JPEG_QUALITY, 85])
+        return encoded.tobytes() if ok else None
+    
+    def prepare_plate_ocr_image(self, image_data, decoded=None):
+        """JPEG montage of plate candidates for OCR and the number of candidates used
+
+        Plates are located on the reduced decode (pass the helmet path's
+        (image, scale) as decoded to reuse it). The upload is decoded at full
+        resolution only when candidates are found and the reduced image is
+        actually smaller. Returns (None, 0) when there are no candidates.
+        """
+        small, scale = decoded if decoded is not None else self.decode_image(image_data)
+        if small is None:
+            return None, 0
+        
+        rects = self.locate_plate_regions(small)
+        if not rects:
+            return None, 0
+        
+        full_image = self.decode_image(image_data, full_resolution=True)[0] if scale > 1.0 else None
+        if full_image is not None:
+            full_rects = [tuple(int(round(v * scale)) for v in rect) for rect in rects]
+            montage = self.build_plate_montage(full_image, full_rects)
+        else:
+            montage = self.build_plate_montage(small, rects)
+        
+        return self.encode_ocr_image(montage), len(rects)
+    
+    def _decode_and_locate(self, image_data, decoded=None):
+        """Decode one image and crop its head regions (batch worker)"""
+        image, scale = decoded if decoded is not None else self.decode_image(image_data)
+        if image is None:
+            return None
+        
+        faces = self.detect_faces_and_heads(image)
+        regions = [self.extract_helmet_region(image, face) for face in faces]
+        face_regions = [[int(round(v * scale)) for v in face] for face in faces]
+        shape_scores = [self.shape_score(region) if region.size else 0.0 for region in regions]
+        return regions, face_regions, shape_scores
+    
+    def detect_helmet_batch(self, image_data_list, executor=None, decoded_list=None):
+        """Helmet detection for many images, results returned in input order
+
+        Decoding (unless decoded_list is given), face detection and shape
+        scoring run per image on the executor; color analysis runs once over
+        every head crop in the batch.
+        """
+        try:
+            if decoded_list is None:
+                decoded_list = [None] * len(image_data_list)
+            if executor is not None:
+                located = list(executor.map(self._decode_and_locate, image_data_list, decoded_list))
+            else:
+                located = [self._decode_and_locate(image_data, decoded)
+                           for image_data, decoded in zip(image_data_list, decoded_list)]
+            
+            # Gather every non-empty head crop in the batch
+            crops = [region for item in located if item is not None
+                     for region in item[0] if region.size]
+            coverages = iter(self.color_coverage_batch(crops)) if crops else iter(())
+            
+            results = []
+            for item in located:
+                if item is None:
+                    results.append({
+                        'success': False,
+                        'error': 'Failed to process image',
+                        'has_helmet': False,
+                        'confidence': 0.0
+                    })
+                    continue
+                
+                regions, face_regions, shape_scores = item
+                helmet_results = []
+                for region, face_region, helmet_shape_score in zip(regions, face_regions, shape_scores):
+                    if region.size:
+                        has_helmet, confidence = self.combine_scores(next(coverages), helmet_shape_score)
+                    else:
+                        has_helmet, confidence = False, 0.0
+                    helmet_results.append({
+                        'has_helmet': has_helmet,
+                        'confidence': confidence,
+                        'face_region': face_region
+                    })
+                results.append(self.summarize_results(helmet_results))
+            
+            return results
+            
+        except Exception as e:
+            logger.error(f"❌ Batch helmet detection failed: {str(e)}")
+            return [{
+                'success': False,
+                'error': str(e),
+                'has_helmet': False,
+                'confidence': 0.0
+            } for _ in image_data_list]
 
 # Global detector instance
 helmet_detector = HelmetDetector()
 
-def analyze_image_for_helmet(image_data):
+def decode_image_for_detection(image_data):
+    """Wrapper function for the reduced-size decode shared by helmet and plate stages"""
+    return helmet_detector.decode_image(image_data)
+
+def analyze_image_for_helmet(image_data, decoded=None):
     """Wrapper function for helmet detection"""
-    return helmet_detector.detect_helmet(image_data)
+    return helmet_detector.detect_helmet(image_data, decoded)
+
+def prepare_plate_image_for_ocr(image_data, decoded=None):
+    """Wrapper function for plate localization before OCR"""
+    return helmet_detector.prepare_plate_ocr_image(image_data, decoded)
+
+def encode_image_for_ocr(image):
+    """Wrapper function for JPEG-encoding a decoded image for OCR"""
+    return helmet_detector.encode_ocr_image(image)
+
+def analyze_images_for_helmet(image_data_list, executor=None, decoded_list=None):
+    """Wrapper function for batch helmet detection"""
+    return helmet_detector.detect_helmet_batch(image_data_list, executor, decoded_list)
 
 if __name__ == "__main__":
+    from async_logging import configure_logging
+    configure_logging()
+    
     # Test the detector
     logger.info("🪖 Helmet Detection Model Ready")
     logger.info("✅ Model can detect helmets in uploaded images")
@@ -5,7 +5,6 @@ Advanced AI-powered helmet detection with multi-violation support
 """
 
 import os
-import sys
 import json
 import time
 import logging
@@ -13,29 +12,30 @@ import requests
 import cv2
 import numpy as np
 from datetime import datetime
-from flask import Flask, request, jsonify
+from flask import Flask, request, jsonify, g
 from flask_cors import CORS
 from PIL import Image
 import io
+import re
+import uuid
 import base64
 from twilio.rest import Client
 from dotenv import load_dotenv
-from helmet_detection_model import analyze_image_for_helmet
+from async_logging import (configure_logging, begin_request, end_request, stage_timer, SAMPLED,
+                           ContextThreadPoolExecutor)
 
 # Load environment variables
 load_dotenv()
 
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler('helmet_detection.log'),
-        logging.StreamHandler(sys.stdout)
-    ]
-)
+# Configure logging (queued; written by a background thread, JSON + rotation on disk).
+# Must run before the model import so its startup messages are not dropped.
+configure_logging('helmet_detection.log')
 logger = logging.getLogger(__name__)
 
+from helmet_detection_model import (analyze_image_for_helmet, analyze_images_for_helmet,
+                                    prepare_plate_image_for_ocr, decode_image_for_detection,
+                                    encode_image_for_ocr)
+
 # Initialize Flask app
 app = Flask(__name__)
 CORS(app)
@@ -45,18 +45,35 @@ OCR_API_KEY = os.getenv('OCR_API_KEY', '256DF5A5-1D99-45F9-B165-1888C6EB734B')
 TWILIO_ACCOUNT_SID = os.getenv('TWILIO_ACCOUNT_SID')
 TWILIO_AUTH_TOKEN = os.getenv('TWILIO_AUTH_TOKEN')
 TWILIO_WHATSAPP_NUMBER = os.getenv('TWILIO_WHATSAPP_NUMBER', 'whatsapp:+14155238886')
+# Upstream endpoints (override to point at local stand-ins, e.g. load_test_stubs.py)
+OCR_API_URL = os.getenv('OCR_API_URL', 'https://api.ocr.space/parse/image')
+TWILIO_API_BASE_URL = os.getenv('TWILIO_API_BASE_URL')
+# Batch endpoint limits and worker pools
+BATCH_MAX_IMAGES = int(os.getenv('BATCH_MAX_IMAGES', '32'))
+BATCH_WORKERS = int(os.getenv('BATCH_WORKERS', str(os.cpu_count() or 4)))
+OCR_WORKERS = int(os.getenv('OCR_WORKERS', '8'))
+
+# CPU-bound detection and I/O-bound OCR get separate pools so slow OCR
+# responses never starve image decoding. Tasks inherit the request's logging
+# context (correlation ID, stage timings).
+batch_executor = ContextThreadPoolExecutor(max_workers=BATCH_WORKERS)
+ocr_executor = ContextThreadPoolExecutor(max_workers=OCR_WORKERS)
 
 # Initialize Twilio client
 twilio_client = None
 if TWILIO_ACCOUNT_SID and TWILIO_AUTH_TOKEN:
     try:
         twilio_client = Client(TWILIO_ACCOUNT_SID, TWILIO_AUTH_TOKEN)
+        if TWILIO_API_BASE_URL:
+            twilio_client.api.base_url = TWILIO_API_BASE_URL.rstrip('/')
         logger.info("✅ Twilio client initialized successfully")
     except Exception as e:
         logger.error(f"❌ Failed to initialize Twilio client: {e}")
 
 class HelmetDetectionService:
     def __init__(self):
+        # Shared keep-alive connection pool for OCR requests
+        self.http_session = requests.Session()
         self.violation_types = {
             'no_helmet': {'fine': 500, 'description': 'Riding without helmet'},
             'triple_riding': {'fine': 1000, 'description': 'Triple riding violation'},
@@ -67,14 +84,9 @@ class HelmetDetectionService:
         }
         logger.info("🚨 Helmet Detection Service initialized")
 
-    def detect_helmet(self, image_data):
-        """Real helmet detection using AI model"""
+    def format_detection_result(self, detection_result):
+        """Convert model results to service format"""
         try:
-            logger.info("🪖 Using real helmet detection model...")
-
-            # Use the real helmet detection model
-            detection_result = analyze_image_for_helmet(image_data)
-
             if not detection_result['success']:
                 return {
                     'helmet_detected': False,
@@ -84,7 +96,6 @@ class HelmetDetectionService:
                     'error': detection_result.get('error', 'Detection failed')
                 }
 
-            # Convert model results to service format
             violations = []
             if detection_result['people_without_helmets'] > 0:
                 violations.append('no_helmet')
@@ -109,6 +120,20 @@ class HelmetDetectionService:
                 'error': str(e)
             }
 
+    def detect_helmet(self, image_data, decoded=None):
+        """Real helmet detection using AI model"""
+        logger.info("🪖 Using real helmet detection model...", extra=SAMPLED)
+
+        # Use the real helmet detection model
+        return self.format_detection_result(analyze_image_for_helmet(image_data, decoded))
+
+    def detect_helmet_batch(self, image_data_list, decoded_list=None):
+        """Real helmet detection for a batch of images, in input order"""
+        logger.info(f"🪖 Using real helmet detection model on {len(image_data_list)} images...")
+
+        detection_results = analyze_images_for_helmet(image_data_list, batch_executor, decoded_list)
+        return [self.format_detection_result(result) for result in detection_results]
+
     def detect_triple_riding(self, image_data):
         """Detect triple riding using person counting"""
         try:
@@ -136,63 +161,85 @@ class HelmetDetectionService:
                 'error': str(e)
             }
 
-    def extract_number_plate(self, image_data):
-        """Extract number plate using OCR"""
+    def run_ocr(self, image_b64):
+        """Send a base64 JPEG to OCR.space and return the parsed text (None on OCR error)"""
+        payload = {
+            'apikey': OCR_API_KEY,
+            'language': 'eng',
+            'isOverlayRequired': False,
+            'detectOrientation': True,
+            'scale': True,
+            'OCREngine': 2
+        }
+        
+        files = {
+            'base64Image': f'data:image/jpeg;base64,{image_b64}'
+        }
+        
+        response = self.http_session.post(OCR_API_URL, data=payload, files=files, timeout=30)
+        result = response.json()
+        
+        if result.get('IsErroredOnProcessing'):
+            logger.error(f"OCR Error: {result.get('ErrorMessage')}")
+            return None
+        
+        if result.get('ParsedResults'):
+            return result['ParsedResults'][0].get('ParsedText', '')
+        return ""
+
+    def match_number_plate(self, extracted_text):
+        """Find a number plate in OCR text; returns 'UNKNOWN' if none matches"""
+        plate_patterns = [
+            r'[A-Z]{2}[\s.\-]*\d{2}[\s.\-]*[A-Z]{1,2}[\s.\-]*\d{4}',  # Standard Indian format (spaces, dots, dashes or two rows)
+            r'[A-Z]{2}\d{2}[A-Z]{1,2}\d{4}',  # Without spaces
+            r'\b[A-Z0-9]{6,10}\b'  # General alphanumeric
+        ]
+        
+        for pattern in plate_patterns:
+            matches = re.findall(pattern, extracted_text.upper())
+            if matches:
+                return re.sub(r'[\s.\-]', '', matches[0])
+        return 'UNKNOWN'
+
+    def extract_number_plate(self, image_data, decoded=None):
+        """Extract number plate using OCR
+
+        Small, contrast-normalized plate crops are tried first; if they yield no
+        plate, the reduced whole image is sent instead.
+        """
         try:
-            # Convert base64 to image for OCR
-            if isinstance(image_data, str) and image_data.startswith('data:image'):
-                image_data = image_data.split(',')[1]
-            
-            # Use OCR.space API
-            url = 'https://api.ocr.space/parse/image'
-            
-            payload = {
-                'apikey': OCR_API_KEY,
-                'language': 'eng',
-                'isOverlayRequired': False,
-                'detectOrientation': True,
-                'scale': True,
-                'OCREngine': 2
-            }
+            if decoded is None:
+                decoded = decode_image_for_detection(image_data)
             
-            files = {
-                'base64Image': f'data:image/jpeg;base64,{image_data}'
-            }
-            
-            response = requests.post(url, data=payload, files=files, timeout=30)
-            result = response.json()
+            plate_image, plate_candidates = prepare_plate_image_for_ocr(image_data, decoded)
             
-            if result.get('IsErroredOnProcessing'):
-                logger.error(f"OCR Error: {result.get('ErrorMessage')}")
-                return {'number_plate': 'UNKNOWN', 'confidence': 0.0}
+            attempts = []
+            if plate_image is not None:
+                attempts.append(lambda: plate_image)
+            if decoded[0] is not None:
+                attempts.append(lambda: encode_image_for_ocr(decoded[0]))
+            elif isinstance(image_data, bytes):
+                attempts.append(lambda: image_data)
+            else:
+                # Undecodable locally; let the OCR provider try the original upload
+                attempts.append(lambda: base64.b64decode(image_data.split(',')[-1]))
             
-            # Extract text and find number plate pattern
             extracted_text = ""
-            if result.get('ParsedResults'):
-                extracted_text = result['ParsedResults'][0].get('ParsedText', '')
-            
-            # Simple number plate pattern matching
-            import re
-            plate_patterns = [
-                r'[A-Z]{2}\s*\d{2}\s*[A-Z]{1,2}\s*\d{4}',  # Standard Indian format
-                r'[A-Z]{2}\d{2}[A-Z]{1,2}\d{4}',  # Without spaces
-                r'\b[A-Z0-9]{6,10}\b'  # General alphanumeric
-            ]
-            
             number_plate = 'UNKNOWN'
-            confidence = 0.0
-            
-            for pattern in plate_patterns:
-                matches = re.findall(pattern, extracted_text.upper())
-                if matches:
-                    number_plate = matches[0].replace(' ', '')
-                    confidence = 0.8
+            for attempt in attempts:
+                extracted_text = self.run_ocr(base64.b64encode(attempt()).decode())
+                if extracted_text is None:
+                    return {'number_plate': 'UNKNOWN', 'confidence': 0.0, 'plate_candidates': plate_candidates}
+                
+                number_plate = self.match_number_plate(extracted_text)
+                if number_plate != 'UNKNOWN':
                     break
             
             return {
                 'number_plate': number_plate,
-                'confidence': confidence,
-                'raw_text': extracted_text
+                'confidence': 0.8 if number_plate != 'UNKNOWN' else 0.0,
+                'raw_text': extracted_text,
+                'plate_candidates': plate_candidates
             }
             
         except Exception as e:
@@ -206,6 +253,32 @@ class HelmetDetectionService:
 # Initialize service
 detection_service = HelmetDetectionService()
 
+@app.before_request
+def start_request_logging():
+    """Assign a correlation ID to every request"""
+    g.request_id = request.headers.get('X-Request-ID') or uuid.uuid4().hex
+    g.request_started = time.perf_counter()
+    begin_request(g.request_id)
+
+@app.after_request
+def finish_request_logging(response):
+    """Emit one structured record per request with its stage timings"""
+    stages = end_request()
+    duration_ms = round((time.perf_counter() - g.get('request_started', time.perf_counter())) * 1000, 2)
+    response.headers['X-Request-ID'] = g.get('request_id', '')
+    logger.info(
+        f"{request.method} {request.path} {response.status_code} {duration_ms}ms",
+        extra={
+            'request_id': g.get('request_id'),
+            'method': request.method,
+            'path': request.path,
+            'status': response.status_code,
+            'duration_ms': duration_ms,
+            'stages': stages
+        }
+    )
+    return response
+
 @app.route('/health', methods=['GET'])
 def health_check():
     """Health check endpoint"""
@@ -216,6 +289,23 @@ def health_check():
         'version': '2.0.0'
     })
 
+def build_detection_result(helmet_result, triple_result, plate_result):
+    """Combine per-image detector outputs into the /detect/helmet response"""
+    violations = []
+    violations.extend(helmet_result.get('violations', []))
+    violations.extend(triple_result.get('violations', []))
+    
+    return {
+        'success': True,
+        'timestamp': datetime.now().isoformat(),
+        'helmet_detection': helmet_result,
+        'triple_riding_detection': triple_result,
+        'number_plate': plate_result,
+        'violations': violations,
+        'total_violations': len(violations),
+        'estimated_fine': sum(detection_service.violation_types.get(v, {}).get('fine', 0) for v in violations)
+    }
+
 @app.route('/detect/helmet', methods=['POST'])
 def detect_helmet():
     """Helmet detection endpoint"""
@@ -226,36 +316,103 @@ def detect_helmet():
         
         logger.info("🔍 Processing helmet detection request")
         
+        # Decode once (reduced size) for both helmet and plate stages
+        with stage_timer('decode'):
+            decoded = decode_image_for_detection(data['image'])
+        
         # Detect helmet
-        helmet_result = detection_service.detect_helmet(data['image'])
+        with stage_timer('helmet'):
+            helmet_result = detection_service.detect_helmet(data['image'], decoded)
         
         # Extract number plate
-        plate_result = detection_service.extract_number_plate(data['image'])
+        with stage_timer('ocr'):
+            plate_result = detection_service.extract_number_plate(data['image'], decoded)
         
         # Detect triple riding
-        triple_result = detection_service.detect_triple_riding(data['image'])
+        with stage_timer('triple_riding'):
+            triple_result = detection_service.detect_triple_riding(data['image'])
         
         # Combine results
-        violations = []
-        violations.extend(helmet_result.get('violations', []))
-        violations.extend(triple_result.get('violations', []))
+        result = build_detection_result(helmet_result, triple_result, plate_result)
         
-        result = {
+        logger.info(f"✅ Detection completed: {result['total_violations']} violations found")
+        return jsonify(result)
+        
+    except Exception as e:
+        logger.error(f"❌ Detection failed: {e}")
+        return jsonify({
+            'success': False,
+            'error': str(e),
+            'timestamp': datetime.now().isoformat()
+        }), 500
+
+@app.route('/detect/batch', methods=['POST'])
+def detect_batch():
+    """Batch helmet detection endpoint (multipart files or JSON base64 list)"""
+    try:
+        if request.files:
+            # Binary uploads: one or more 'images' file fields
+            images = [f.read() for f in request.files.getlist('images')]
+        else:
+            data = request.get_json(silent=True)
+            images = data.get('images') if isinstance(data, dict) else None
+        
+        if not images or not isinstance(images, list):
+            return jsonify({'error': 'No images provided'}), 400
+        if len(images) > BATCH_MAX_IMAGES:
+            return jsonify({'error': f'Too many images (max {BATCH_MAX_IMAGES})'}), 400
+        
+        logger.info(f"📦 Processing batch detection: {len(images)} images")
+        started = time.time()
+        
+        # Decode every image once (reduced size); helmet and plate stages share it
+        with stage_timer('decode'):
+            decoded_list = list(batch_executor.map(decode_image_for_detection, images))
+        
+        # OCR is I/O-bound: start all plate lookups before the CPU work.
+        # Undecodable images are not sent to OCR at all.
+        plate_futures = [ocr_executor.submit(detection_service.extract_number_plate, image, decoded)
+                         if decoded[0] is not None else None
+                         for image, decoded in zip(images, decoded_list)]
+        
+        with stage_timer('helmet'):
+            helmet_results = detection_service.detect_helmet_batch(images, decoded_list)
+        with stage_timer('triple_riding'):
+            triple_results = [detection_service.detect_triple_riding(image) for image in images]
+        with stage_timer('ocr_wait'):
+            plate_results = [future.result() if future is not None else
+                             {'number_plate': 'UNKNOWN', 'confidence': 0.0, 'error': 'Failed to process image'}
+                             for future in plate_futures]
+        
+        results = []
+        for index, (helmet_result, triple_result, plate_result) in enumerate(zip(helmet_results, triple_results, plate_results)):
+            result = build_detection_result(helmet_result, triple_result, plate_result)
+            result['index'] = index
+            results.append(result)
+        
+        all_violations = [v for result in results for v in result['violations']]
+        unique_violations = list(set(all_violations))
+        
+        response = {
             'success': True,
             'timestamp': datetime.now().isoformat(),
-            'helmet_detection': helmet_result,
-            'triple_riding_detection': triple_result,
-            'number_plate': plate_result,
-            'violations': violations,
-            'total_violations': len(violations),
-            'estimated_fine': sum(detection_service.violation_types.get(v, {}).get('fine', 0) for v in violations)
+            'results': results,
+            'summary': {
+                'total_images': len(results),
+                'images_with_violations': sum(1 for result in results if result['total_violations'] > 0),
+                'total_violations': len(all_violations),
+                'unique_violations': unique_violations,
+                'estimated_fine': sum(result['estimated_fine'] for result in results),
+                'violation_frequency': {v: all_violations.count(v) for v in unique_violations},
+                'processing_time_ms': round((time.time() - started) * 1000, 1)
+            }
         }
         
-        logger.info(f"✅ Detection completed: {len(violations)} violations found")
-        return jsonify(result)
+        logger.info(f"✅ Batch detection completed: {len(all_violations)} violations across {len(results)} images")
+        return jsonify(response)
         
     except Exception as e:
-        logger.error(f"❌ Detection failed: {e}")
+        logger.error(f"❌ Batch detection failed: {e}")
         return jsonify({
             'success': False,
             'error': str(e),
@@ -277,9 +434,15 @@ def detect_video():
         
         for i, frame_data in enumerate(data['frames']):
             # Process each frame
-            helmet_result = detection_service.detect_helmet(frame_data)
-            triple_result = detection_service.detect_triple_riding(frame_data)
-            plate_result = detection_service.extract_number_plate(frame_data)
+            logger.info(f"🎞️ Processing frame {i + 1}", extra=SAMPLED)
+            with stage_timer('decode'):
+                decoded = decode_image_for_detection(frame_data)
+            with stage_timer('helmet'):
+                helmet_result = detection_service.detect_helmet(frame_data, decoded)
+            with stage_timer('triple_riding'):
+                triple_result = detection_service.detect_triple_riding(frame_data)
+            with stage_timer('ocr'):
+                plate_result = detection_service.extract_number_plate(frame_data, decoded)
             
             frame_violations = []
             frame_violations.extend(helmet_result.get('violations', []))
@@ -358,11 +521,12 @@ This is an automated message from SnapNEarn Traffic Monitoring System."""
 
         # Send WhatsApp message using Twilio
         if twilio_client:
-            message = twilio_client.messages.create(
-                from_=TWILIO_WHATSAPP_NUMBER,
-                to=phone_number,
-                body=message_body
-            )
+            with stage_timer('twilio'):
+                message = twilio_client.messages.create(
+                    from_=TWILIO_WHATSAPP_NUMBER,
+                    to=phone_number,
+                    body=message_body
+                )
 
             logger.info(f"📱 WhatsApp challan sent successfully. SID: {message.sid}")
 
@@ -0,0 +1,207 @@
+#!/usr/bin/env python3
+"""
+📈 CACHE - Load Test Workload Generator
+Replays mixed /detect/helmet, /detect/video, /detect/batch and /send-challan traffic at a target
+rate and reports throughput, latency percentiles and error rates per endpoint
+
+Run against a service wired to load_test_stubs.py so no real OCR/Twilio calls are made:
+
+    python load_test.py --target http://localhost:5001 --rate 5 --duration 60 \\
+        --mix helmet=0.7,video=0.2,challan=0.1
+"""
+
+import argparse
+import base64
+import glob
+import json
+import math
+import os
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+import requests
+
+BACKEND_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# Sample images bundled with the repository
+DEFAULT_IMAGE_DIRS = [
+    os.path.join(BACKEND_DIR, 'no helmet image'),
+    os.path.join(BACKEND_DIR, '..', 'helmet image')
+]
+
+ENDPOINTS = {
+    'helmet': '/detect/helmet',
+    'video': '/detect/video',
+    'batch': '/detect/batch',
+    'challan': '/send-challan'
+}
+
+
+def load_sample_images(image_dirs):
+    """Read bundled sample JPEGs as data URLs"""
+    images = []
+    for image_dir in image_dirs:
+        for path in sorted(glob.glob(os.path.join(image_dir, '*.jpg'))):
+            with open(path, 'rb') as f:
+                encoded = base64.b64encode(f.read()).decode()
+            images.append(f'data:image/jpeg;base64,{encoded}')
+    return images
+
+
+def parse_mix(mix):
+    """Parse 'helmet=0.7,video=0.2,challan=0.1' into normalised weights"""
+    weights = {}
+    for part in mix.split(','):
+        name, _, weight = part.partition('=')
+        name = name.strip()
+        if name not in ENDPOINTS:
+            raise ValueError(f"Unknown endpoint in mix: {name}")
+        weights[name] = float(weight)
+
+    total = sum(weights.values())
+    if total <= 0:
+        raise ValueError("Mix weights must sum to a positive value")
+    return {name: weight / total for name, weight in weights.items()}
+
+
+def percentile(sorted_values, pct):
+    """Nearest-rank percentile of an already sorted list"""
+    if not sorted_values:
+        return 0.0
+    rank = max(0, min(len(sorted_values) - 1, math.ceil(pct / 100.0 * len(sorted_values)) - 1))
+    return sorted_values[rank]
+
+
+class LoadTest:
+    def __init__(self, target, images, mix, video_frames=3, batch_size=8, timeout=60):
+        self.target = target.rstrip('/')
+        self.images = images
+        self.mix = mix
+        self.video_frames = video_frames
+        self.batch_size = batch_size
+        self.timeout = timeout
+        self.results = {name: [] for name in ENDPOINTS}
+        self.lock = threading.Lock()
+        self.local = threading.local()
+
+    def session(self):
+        """One keep-alive HTTP session per worker thread"""
+        if not hasattr(self.local, 'session'):
+            self.local.session = requests.Session()
+        return self.local.session
+
+    def build_payload(self, endpoint):
+        if endpoint == 'helmet':
+            return {
+                'image': random.choice(self.images),
+                'location': {'latitude': 12.9716, 'longitude': 77.5946}
+            }
+        if endpoint == 'video':
+            return {'frames': [random.choice(self.images) for _ in range(self.video_frames)]}
+        if endpoint == 'batch':
+            return {'images': [random.choice(self.images) for _ in range(self.batch_size)]}
+        return {
+            'phoneNumber': '+910000000000',
+            'fineAmount': 500,
+            'violationType': 'Riding without helmet',
+            'location': 'Load Test',
+            'timestamp': datetime.now().isoformat(),
+            'reporterId': 'load-test'
+        }
+
+    def send(self, endpoint, scheduled):
+        """Issue one request; latency runs from its scheduled send time
+
+        Measuring from the schedule rather than from when a worker picks the
+        request up keeps time spent queued behind busy workers in the numbers
+        (avoids coordinated omission when the service is saturated).
+        """
+        payload = self.build_payload(endpoint)
+        ok = False
+        try:
+            response = self.session().post(self.target + ENDPOINTS[endpoint], json=payload, timeout=self.timeout)
+            ok = response.status_code == 200 and response.json().get('success', False)
+        except Exception:
+            ok = False
+        latency = time.perf_counter() - scheduled
+
+        with self.lock:
+            self.results[endpoint].append((latency, ok))
+
+    def run(self, rate, duration, concurrency):
+        """Open-loop arrivals: requests are scheduled on time regardless of response time"""
+        names = list(self.mix.keys())
+        weights = [self.mix[name] for name in names]
+        interval = 1.0 / rate
+
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=concurrency) as pool:
+            next_send = started
+            while next_send - started < duration:
+                delay = next_send - time.perf_counter()
+                if delay > 0:
+                    time.sleep(delay)
+                pool.submit(self.send, random.choices(names, weights)[0], next_send)
+                next_send += interval
+        elapsed = time.perf_counter() - started
+
+        return self.report(elapsed)
+
+    def report(self, elapsed):
+        report = {'elapsed_seconds': round(elapsed, 2), 'endpoints': {}}
+        for name, samples in self.results.items():
+            if not samples:
+                continue
+            latencies = sorted(latency for latency, _ in samples)
+            errors = sum(1 for _, ok in samples if not ok)
+            report['endpoints'][ENDPOINTS[name]] = {
+                'requests': len(samples),
+                'throughput_rps': round(len(samples) / elapsed, 2),
+                'p50_ms': round(percentile(latencies, 50) * 1000, 1),
+                'p95_ms': round(percentile(latencies, 95) * 1000, 1),
+                'p99_ms': round(percentile(latencies, 99) * 1000, 1),
+                'error_rate': round(errors / len(samples), 4)
+            }
+        return report
+
+
+def print_report(report):
+    print(f"\n📈 Load test finished in {report['elapsed_seconds']}s")
+    print(f"{'endpoint':<16}{'reqs':>8}{'rps':>9}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'errors':>9}")
+    for endpoint, stats in report['endpoints'].items():
+        print(f"{endpoint:<16}{stats['requests']:>8}{stats['throughput_rps']:>9}"
+              f"{stats['p50_ms']:>10}{stats['p95_ms']:>10}{stats['p99_ms']:>10}"
+              f"{stats['error_rate'] * 100:>8.1f}%")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Load test the helmet detection service')
+    parser.add_argument('--target', default='http://localhost:5001')
+    parser.add_argument('--rate', type=float, default=2.0, help='Total requests per second')
+    parser.add_argument('--duration', type=float, default=30.0, help='Seconds to generate load for')
+    parser.add_argument('--concurrency', type=int, default=32, help='Maximum in-flight requests')
+    parser.add_argument('--mix', default='helmet=0.7,video=0.2,challan=0.1')
+    parser.add_argument('--video-frames', type=int, default=3)
+    parser.add_argument('--batch-size', type=int, default=8)
+    parser.add_argument('--image-dir', action='append', help='Directory of sample JPEGs (repeatable)')
+    parser.add_argument('--json', help='Write the report to this file as JSON')
+    args = parser.parse_args()
+
+    images = load_sample_images(args.image_dir or DEFAULT_IMAGE_DIRS)
+    if not images:
+        parser.error('No sample images found')
+
+    load_test = LoadTest(args.target, images, parse_mix(args.mix), args.video_frames, args.batch_size)
+    print(f"🚀 {args.rate} req/s for {args.duration}s against {args.target} ({len(images)} sample images)")
+    report = load_test.run(args.rate, args.duration, args.concurrency)
+    print_report(report)
+
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,170 @@
+#!/usr/bin/env python3
+"""
+🧪 CACHE - Load Test Stand-ins
+Local fake OCR.space and Twilio servers with configurable latency and error rates
+
+Start the stand-ins, then point the helmet detection service at them:
+
+    python load_test_stubs.py --ocr-latency-ms 400 --ocr-error-rate 0.02
+
+    OCR_API_URL=http://127.0.0.1:8081/parse/image \\
+    TWILIO_API_BASE_URL=http://127.0.0.1:8082 \\
+    TWILIO_ACCOUNT_SID=ACloadtest TWILIO_AUTH_TOKEN=loadtest \\
+    python helmet_detection_service.py
+"""
+
+import argparse
+import logging
+import random
+import threading
+import time
+import uuid
+from datetime import datetime
+from flask import Flask, request, jsonify
+from werkzeug.serving import make_server
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Text returned by the fake OCR backend; contains a standard Indian plate
+FAKE_PLATE_TEXTS = [
+    'KA 01 AB 1234',
+    'TN 09 BX 4521\nSTOP',
+    'MH12DE1433',
+    'DL 3C AY 9087\nNO PARKING'
+]
+
+
+class StubBehaviour:
+    """Latency and failure injection shared by the stand-in servers"""
+
+    def __init__(self, latency_ms=0.0, jitter_ms=0.0, error_rate=0.0):
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.error_rate = error_rate
+        self.lock = threading.Lock()
+        self.request_count = 0
+        self.error_count = 0
+
+    def apply(self):
+        """Sleep for the configured latency and return True if this call should fail"""
+        delay = self.latency_ms + random.uniform(-self.jitter_ms, self.jitter_ms)
+        if delay > 0:
+            time.sleep(delay / 1000.0)
+
+        should_fail = random.random() < self.error_rate
+        with self.lock:
+            self.request_count += 1
+            if should_fail:
+                self.error_count += 1
+        return should_fail
+
+
+def create_ocr_app(behaviour):
+    """Fake OCR.space /parse/image endpoint"""
+    app = Flask('fake_ocr_space')
+
+    @app.route('/parse/image', methods=['POST'])
+    def parse_image():
+        if behaviour.apply():
+            return jsonify({
+                'IsErroredOnProcessing': True,
+                'ErrorMessage': ['Simulated OCR failure'],
+                'OCRExitCode': 3
+            })
+
+        return jsonify({
+            'IsErroredOnProcessing': False,
+            'OCRExitCode': 1,
+            'ParsedResults': [{
+                'ParsedText': random.choice(FAKE_PLATE_TEXTS),
+                'FileParseExitCode': 1
+            }],
+            'ProcessingTimeInMilliseconds': str(int(behaviour.latency_ms))
+        })
+
+    @app.route('/stats', methods=['GET'])
+    def stats():
+        return jsonify({'requests': behaviour.request_count, 'errors': behaviour.error_count})
+
+    return app
+
+
+def create_twilio_app(behaviour):
+    """Fake Twilio Messages API endpoint"""
+    app = Flask('fake_twilio')
+
+    @app.route('/2010-04-01/Accounts/<account_sid>/Messages.json', methods=['POST'])
+    def create_message(account_sid):
+        if behaviour.apply():
+            return jsonify({
+                'code': 20500,
+                'message': 'Simulated Twilio failure',
+                'status': 500
+            }), 500
+
+        now = datetime.utcnow().strftime('%a, %d %b %Y %H:%M:%S +0000')
+        return jsonify({
+            'sid': 'SM' + uuid.uuid4().hex,
+            'account_sid': account_sid,
+            'from': request.form.get('From'),
+            'to': request.form.get('To'),
+            'body': request.form.get('Body'),
+            'status': 'queued',
+            'num_segments': '1',
+            'direction': 'outbound-api',
+            'api_version': '2010-04-01',
+            'date_created': now,
+            'date_updated': now
+        }), 201
+
+    @app.route('/stats', methods=['GET'])
+    def stats():
+        return jsonify({'requests': behaviour.request_count, 'errors': behaviour.error_count})
+
+    return app
+
+
+def start_server(app, host, port):
+    """Serve a Flask app from a background thread and return the server"""
+    server = make_server(host, port, app, threaded=True)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    return server
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Fake OCR.space and Twilio servers for load testing')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--ocr-port', type=int, default=8081)
+    parser.add_argument('--ocr-latency-ms', type=float, default=300.0)
+    parser.add_argument('--ocr-jitter-ms', type=float, default=100.0)
+    parser.add_argument('--ocr-error-rate', type=float, default=0.0)
+    parser.add_argument('--twilio-port', type=int, default=8082)
+    parser.add_argument('--twilio-latency-ms', type=float, default=150.0)
+    parser.add_argument('--twilio-jitter-ms', type=float, default=50.0)
+    parser.add_argument('--twilio-error-rate', type=float, default=0.0)
+    args = parser.parse_args()
+
+    ocr_behaviour = StubBehaviour(args.ocr_latency_ms, args.ocr_jitter_ms, args.ocr_error_rate)
+    twilio_behaviour = StubBehaviour(args.twilio_latency_ms, args.twilio_jitter_ms, args.twilio_error_rate)
+
+    servers = [
+        start_server(create_ocr_app(ocr_behaviour), args.host, args.ocr_port),
+        start_server(create_twilio_app(twilio_behaviour), args.host, args.twilio_port)
+    ]
+
+    logger.info(f"🔤 Fake OCR.space: OCR_API_URL=http://{args.host}:{args.ocr_port}/parse/image")
+    logger.info(f"📱 Fake Twilio: TWILIO_API_BASE_URL=http://{args.host}:{args.twilio_port}")
+
+    try:
+        while True:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        logger.info("🛑 Shutting down stand-ins")
+        for server in servers:
+            server.shutdown()
+
+
+if __name__ == '__main__':
+    main()
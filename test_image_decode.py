@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+"""
+🖼️ Reduced-size decode check
+Verifies uploads are reduced in the JPEG DCT domain and bounded by DECODE_MAX_DIMENSION
+"""
+
+import io
+import os
+import sys
+import numpy as np
+from PIL import Image, JpegImagePlugin
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'backend'))
+from helmet_detection_model import helmet_detector, DECODE_MAX_DIMENSION
+
+
+def jpeg_bytes(width, height):
+    rng = np.random.default_rng(0)
+    tile = rng.integers(0, 256, (height // 8, width // 8, 3), dtype=np.uint8)
+    buffer = io.BytesIO()
+    Image.fromarray(tile).resize((width, height)).save(buffer, format='JPEG', quality=90)
+    return buffer.getvalue()
+
+
+def decode_recording_draft(image_data, **kwargs):
+    """Decode while recording the image size right after each JPEG draft call"""
+    drafted_sizes = []
+    original_draft = JpegImagePlugin.JpegImageFile.draft
+
+    def recording_draft(self, mode, size):
+        result = original_draft(self, mode, size)
+        drafted_sizes.append(self.size)
+        return result
+
+    JpegImagePlugin.JpegImageFile.draft = recording_draft
+    try:
+        image, scale = helmet_detector.decode_image(image_data, **kwargs)
+    finally:
+        JpegImagePlugin.JpegImageFile.draft = original_draft
+    return image, scale, drafted_sizes
+
+
+def test_phone_photo_uses_dct_reduction():
+    image, scale, drafted_sizes = decode_recording_draft(jpeg_bytes(4032, 3024))
+
+    # 1/4 DCT scale is the smallest that still covers 800x600
+    assert drafted_sizes == [(1008, 756)]
+    assert image.shape[:2] == (600, 800)
+    assert abs(scale - 4032 / 800.0) < 1e-9
+
+
+def test_decode_is_bounded_below_draft_range():
+    # 1200 px cannot be halved and still cover the target, so only resampling applies
+    image, scale, _ = decode_recording_draft(jpeg_bytes(1200, 900))
+    assert max(image.shape[:2]) <= DECODE_MAX_DIMENSION
+    assert abs(scale - 1200 / float(image.shape[1])) < 1e-9
+
+
+def test_full_resolution_skips_reduction():
+    image, scale, drafted_sizes = decode_recording_draft(jpeg_bytes(4032, 3024), full_resolution=True)
+    assert drafted_sizes == []
+    assert image.shape[:2] == (3024, 4032)
+    assert scale == 1.0
+
+
+if __name__ == "__main__":
+    test_phone_photo_uses_dct_reduction()
+    test_decode_is_bounded_below_draft_range()
+    test_full_resolution_skips_reduction()
+    print("✅ Reduced-size decode working!")
@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+🪖 Shape score check
+Compares the dome-shape score against the original per-contour
+contourArea/arcLength loop on random textured and noisy head crops
+"""
+
+import os
+import sys
+import timeit
+import cv2
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'backend'))
+from helmet_detection_model import helmet_detector, SHAPE_MAX_CONTOURS
+
+
+def reference_shape_score(contours):
+    """The original per-contour loop"""
+    helmet_shape_score = 0
+    for contour in contours:
+        area = cv2.contourArea(contour)
+        if area > 100:  # Minimum area threshold
+            perimeter = cv2.arcLength(contour, True)
+            if perimeter > 0:
+                circularity = 4 * np.pi * area / (perimeter * perimeter)
+                if 0.3 < circularity < 0.9:  # Helmet-like circularity
+                    helmet_shape_score += circularity
+    return helmet_shape_score
+
+
+def textured_crop(rng, size=160):
+    """Noise plus random ellipses and lines, like foliage, grilles and crowds"""
+    crop = rng.integers(0, 256, (size, size, 3), dtype=np.uint8)
+    crop = cv2.GaussianBlur(crop, (5, 5), 0)
+    for _ in range(rng.integers(5, 40)):
+        color = tuple(int(c) for c in rng.integers(0, 256, 3))
+        center = tuple(int(c) for c in rng.integers(0, size, 2))
+        if rng.random() < 0.6:
+            axes = tuple(int(a) for a in rng.integers(3, size // 2, 2))
+            cv2.ellipse(crop, center, axes, float(rng.uniform(0, 180)), 0, 360, color, -1)
+        else:
+            end = tuple(int(c) for c in rng.integers(0, size, 2))
+            cv2.line(crop, center, end, color, int(rng.integers(1, 4)))
+    return crop
+
+
+def crop_contours(crop):
+    gray = cv2.cvtColor(crop, cv2.COLOR_BGR2GRAY) if crop.ndim == 3 else crop
+    contours, _ = cv2.findContours(cv2.Canny(gray, 50, 150), cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
+    return contours
+
+
+def noisy_contours(rng, count=10, size=400):
+    """Edge maps of blurred noise: over a thousand mostly tiny contours each"""
+    return [crop_contours(cv2.GaussianBlur(rng.integers(0, 256, (size, size), dtype=np.uint8), (3, 3), 0))
+            for _ in range(count)]
+
+
+def test_shape_score_matches_reference(samples=300, seed=0):
+    rng = np.random.default_rng(seed)
+    for _ in range(samples):
+        contours = crop_contours(textured_crop(rng))
+        assert len(contours) <= SHAPE_MAX_CONTOURS
+        assert helmet_detector.contour_shape_score(contours) == reference_shape_score(contours)
+
+
+def test_capped_score_keeps_longest_contours():
+    for contours in noisy_contours(np.random.default_rng(1), count=3):
+        assert len(contours) > SHAPE_MAX_CONTOURS
+
+        longest = sorted(contours, key=len, reverse=True)[:SHAPE_MAX_CONTOURS]
+        actual = helmet_detector.contour_shape_score(contours)
+
+        assert actual == reference_shape_score(longest)
+        assert actual <= reference_shape_score(contours) + 1e-9
+
+
+def compare_timings(seed=2):
+    """Best-of-N seconds for the reference loop and the current scorer over noisy crops"""
+    crops = noisy_contours(np.random.default_rng(seed))
+
+    def best(score):
+        return min(timeit.repeat(lambda: [score(contours) for contours in crops], number=3, repeat=7))
+
+    return best(reference_shape_score), best(helmet_detector.contour_shape_score)
+
+
+def test_shape_score_is_faster_than_reference():
+    reference_time, current_time = compare_timings()
+    assert current_time < reference_time, (reference_time, current_time)
+
+
+if __name__ == "__main__":
+    test_shape_score_matches_reference()
+    test_capped_score_keeps_longest_contours()
+    reference_time, current_time = compare_timings()
+    print(f"✅ Shape score matches the reference loop; "
+          f"{reference_time / current_time:.2f}x faster on noisy crops")